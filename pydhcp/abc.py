@@ -4,8 +4,8 @@ Abstract Baseclasses and Collections for PyDHCP Library
 from abc import ABC
 from enum import IntEnum
 from typing import (
-    Any, ClassVar, Generic, Iterable, Iterator, KeysView,
-    List, Optional, Sequence, Set, Type, TypeVar, ValuesView, cast, overload)
+    Any, ClassVar, Dict, Generic, Iterable, Iterator, KeysView,
+    List, Optional, Sequence, Tuple, Type, TypeVar, ValuesView, cast, overload)
 
 #** Variables **#
 __all__ = ['DHCPOption', 'OptionList']
@@ -13,6 +13,17 @@ __all__ = ['DHCPOption', 'OptionList']
 O = TypeVar('O', bound='DHCPOption')
 T = TypeVar('T', bound='DHCPOption')
 
+#** Functions **#
+
+def _resolve(key: Any) -> Any:
+    """
+    resolve option lookup key (opcode, option or option type) into opcode
+
+    :param key: option lookup key
+    :return:    opcode for the given key
+    """
+    return key if isinstance(key, int) else getattr(key, 'opcode', key)
+
 #** Classes **#
 
 class DHCPOption(ABC):
@@ -22,35 +33,86 @@ class OptionList(Sequence[O], Generic[O]):
     """
     Hybrid Between Dictionary/List for Quick DHCP Option Selection
     """
+    __slots__ = ('data', '_index')
 
     def __init__(self, data: Sequence[O] = ()):
-        self.data:    List[O]  = []
-        self.opcodes: Set[int] = set()
+        self.data:   List[O]        = []
+        self._index: Dict[int, int] = {}
         self.extend(data)
 
+    @classmethod
+    def from_list(cls, data: List[O]) -> 'OptionList[O]':
+        """
+        build option list that takes ownership of an existing list of options
+
+        :param data: freshly built list of options (not copied)
+        :return:     new option list wrapping the given list
+        """
+        index = {op.opcode:n for n, op in enumerate(data)}
+        # fallback to append for duplicates to replace options in-place
+        if len(index) != len(data):
+            return cls(data)
+        self = cls.__new__(cls)
+        self.data   = data
+        self._index = index
+        return self
+
+    def _extend_unchecked(self, values: List[O]):
+        """
+        extend options in bulk without checking for duplicate opcodes
+
+        :param values: options with unique opcodes not already in list
+        """
+        base = len(self.data)
+        self.data.extend(values)
+        self._index.update((op.opcode, n) for n, op in enumerate(values, base))
+
+    def _reindex(self, start: int = 0):
+        """
+        rebuild opcode position index after list positions have shifted
+
+        :param start: first list position to reindex from
+        """
+        for n in range(start, len(self.data)):
+            self._index[self.data[n].opcode] = n
+
+    @property
+    def opcodes(self) -> KeysView[int]:
+        """
+        view of opcodes for all options contained within the list
+        """
+        return self._index.keys()
+
     def append(self, value: O) -> None:
-        if value.opcode not in self.opcodes:
-            self.opcodes.add(value.opcode)
+        if value.opcode not in self._index:
+            self._index[value.opcode] = len(self.data)
             self.data.append(value)
             return
-        for n, op in enumerate(self.data, 0):
-            if op.opcode == value.opcode:
-                self.data[n] = value
-                return
+        self.data[self._index[value.opcode]] = value
 
     def extend(self, values: Iterable[O]) -> None:
-        for op in values:
-            self.append(op)
+        options = list(values)
+        opcodes = {op.opcode for op in options}
+        # fallback to append for duplicates to replace options in-place
+        if len(opcodes) != len(options) or not opcodes.isdisjoint(self._index):
+            for op in options:
+                self.append(op)
+            return
+        self._extend_unchecked(options)
 
     def remove(self, value: O) -> None:
-        self.data.remove(value)
-        self.opcodes.remove(value.opcode)
+        index = self.index(value)
+        del self.data[index]
+        del self._index[value.opcode]
+        self._reindex(index)
 
     def find(self, value: Any,
         start: int = 0, stop: Optional[int] = None) -> Optional[int]:
-        for n, op in enumerate(self.data[start:stop], start):
-            if op == value:
-                return n
+        index = self._index.get(_resolve(value))
+        if index is not None \
+            and index in range(len(self.data))[start:stop] \
+            and self.data[index] == value:
+            return index
 
     def index(self,
         value: Any, start: int = 0, stop: Optional[int] = None) -> int:
@@ -60,11 +122,11 @@ class OptionList(Sequence[O], Generic[O]):
         raise ValueError(f'{value!r} is not in list')
 
     def insert(self, index: int, value: O) -> None:
-        idx = self.find(value)
-        if idx is not None:
-            self.data.remove(value)
+        existing = self._index.pop(value.opcode, None)
+        if existing is not None:
+            del self.data[existing]
         self.data.insert(index, value)
-        self.opcodes.add(value.opcode)
+        self._reindex()
 
     @overload
     def get(self, key: int, default: Any = None) -> Optional[O]:
@@ -75,8 +137,20 @@ class OptionList(Sequence[O], Generic[O]):
         ...
 
     def get(self, key, default = None):
-        key = key.opcode if hasattr(key, 'opcode') else key
-        return self[key] if key in self.opcodes else default
+        index = self._index.get(_resolve(key))
+        return self.data[index] if index is not None else default
+
+    def multi_get(self, *keys: Any, default: Any = None) -> Tuple[Any, ...]:
+        """
+        retrieve several options at once by opcode or option type
+
+        :param keys:    option lookup keys
+        :param default: default value for missing options
+        :return:        tuple of matching options in the order of keys
+        """
+        data, index = self.data, self._index
+        return tuple(data[index[op]] if op in index else default
+            for op in map(_resolve, keys))
 
     def keys(self) -> KeysView[int]:
         return cast(KeysView, (op.opcode for op in self.data))
@@ -85,7 +159,7 @@ class OptionList(Sequence[O], Generic[O]):
         return cast(ValuesView, iter(self.data))
 
     def setdefault(self, op: O, index: Optional[int] = None):
-        if op.opcode in self.opcodes:
+        if op.opcode in self._index:
             return
         if index is None:
             return self.append(op)
@@ -101,8 +175,7 @@ class OptionList(Sequence[O], Generic[O]):
         return len(self.data)
 
     def __contains__(self, key: object, /) -> bool: #type: ignore
-        key = key.opcode if isinstance(key, DHCPOption) else key
-        return key in self.opcodes
+        return _resolve(key) in self._index
 
     @overload
     def __getitem__(self, key: slice, /) -> List[O]:
@@ -115,10 +188,4 @@ class OptionList(Sequence[O], Generic[O]):
     def __getitem__(self, key, /): #type: ignore
         if isinstance(key, slice):
             return self.data.__getitem__(key)
-        key = key.opcode if isinstance(key, DHCPOption) else key
-        if key not in self.opcodes:
-            raise KeyError(key)
-        for op in self.data:
-            if op.opcode == key:
-                return op
-        raise KeyError(key)
+        return self.data[self._index[_resolve(key)]]
@@ -1,10 +1,10 @@
 """
 DHCPv4 Simple UDP Client Implementation
 """
+import os
 import socket
 from datetime import timedelta
 from ipaddress import IPv4Address
-from random import randint
 from typing import List, NamedTuple, Optional
 
 from pyderive import dataclass
@@ -15,6 +15,12 @@ from .. import DomainNameServer, DNSDomainSearchList, IPLeaseTime, Router
 #** Variables **#
 __all__ = ['Client', 'new_message_id']
 
+#: broadcast destination for outgoing dhcp requests
+BROADCAST = ('255.255.255.255', 67)
+
+#: translation table to strip separators from mac-address strings
+MAC_STRIP = str.maketrans('', '', ':-')
+
 #** Functions **#
 
 def new_message_id() -> int:
@@ -23,7 +29,7 @@ def new_message_id() -> int:
 
     :return: new valid message-id integer
     """
-    return randint(1, 2 ** 32)
+    return int.from_bytes(os.urandom(4), 'big') or 1
 
 #** Classes **#
 
@@ -57,7 +63,8 @@ class Client:
         """
         if request.op != OpCode.BootRequest:
             raise ValueError('Message is not DHCP Request')
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        packed = request.pack()
+        sock   = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         if self.interface:
@@ -66,12 +73,18 @@ class Client:
         sock.settimeout(self.timeout)
         try:
             sock.bind(('', 68))
-            sock.sendto(request.pack(), ('255.255.255.255', 67))
+            sock.sendto(packed, BROADCAST)
+            buffer  = bytearray(self.block_size)
+            view    = memoryview(buffer)
+            recv    = sock.recvfrom_into
+            peek_id = Message.peek_id
+            xid     = request.id
             while True:
-                data, _  = sock.recvfrom(self.block_size)
-                response = Message.unpack(data)
-                if response.id == request.id \
-                    and response.op == OpCode.BootReply:
+                size, _ = recv(buffer)
+                if size < 8 or peek_id(view[:size]) != xid:
+                    continue
+                response = Message.unpack(view[:size].tobytes())
+                if response.op == OpCode.BootReply:
                     return response
         finally:
             sock.close()
@@ -85,7 +98,7 @@ class Client:
         """
         # make initial discover request
         id       = new_message_id()
-        hwaddr   = bytes.fromhex(mac.replace(':', '').replace('-', ''))
+        hwaddr   = bytes.fromhex(mac.translate(MAC_STRIP))
         request  = Message.discover(id, hwaddr)
         response = self.request(request)
         if not response.your_addr \
@@ -99,10 +112,8 @@ class Client:
             raise RuntimeError('DHCP Failed to Acknowledge Request')
         # return new assignment
         subnet  = response.subnet_mask()
-        routers = response.options.get(Router)
-        dns     = response.options.get(DomainNameServer)
-        search  = response.options.get(DNSDomainSearchList)
-        lease   = response.options.get(IPLeaseTime)
+        routers, dns, search, lease = response.options.multi_get(
+            Router, DomainNameServer, DNSDomainSearchList, IPLeaseTime)
         if subnet is None:
             raise RuntimeError('Subnet Not Specified')
         if routers is None:
@@ -25,10 +25,12 @@ class DhcpError(Exception):
 
     def __init__(self, msg: Any = None, code: Optional[StatusCode] = None):
         self.message = msg
-        self.code    = code or self.code
+        self._custom = bool(code) and code != self.code
+        if self._custom:
+            self.code = code
 
     def __str__(self) -> str:
-        if self.message and self.__class__.code == self.code:
+        if self.message and not self._custom:
             return str(self.message)
         return super().__str__()
 
@@ -1,17 +1,21 @@
 """
 DHCPv4 Message Object Implementation
 """
+import struct
 from ipaddress import IPv4Address
-from typing import List, Optional, Sequence, Union, cast
-from typing_extensions import Annotated, Self
+from typing import List, Optional, Sequence, Tuple, Union
+from typing_extensions import Self
 
 from pyderive import dataclass
-from pystructs import U16, U32, U8, Const, Context, IPv4, StaticBytes, Struct
+from pystructs import Context
 
 from ..abc import OptionList
 from ..enum import HwType
 from .enum import MessageType, OpCode, OptionCode
 from .options import *
+from .options import (
+    MTYPES, decode_ipv4, decode_option,
+    find_option, pack_option_into, scan_options)
 
 #** Variables **#
 __all__ = ['ZeroIp', 'Message']
@@ -22,32 +26,97 @@ ZeroIp = IPv4Address('0.0.0.0')
 #: magic cookie to include in DHCP message
 MAGIC_COOKIE = bytes((0x63, 0x82, 0x53, 0x63))
 
+#: precompiled fixed-size dhcp message header
+#: (op, htype, hlen, hops, xid, secs, flags, ciaddr, yiaddr, siaddr, giaddr,
+#:  chaddr, sname, file, magic-cookie)
+HEADER = struct.Struct('!BBBBIHH4s4s4s4s16s64s128s4s')
+
+#: header integer fields (name, attribute, layout) re-checked on overflow
+HEADER_INTS = (
+    ('opcode',     'op',      struct.Struct('!B')),
+    ('hw_type',    'hw_type', struct.Struct('!B')),
+    ('hops',       'hops',    struct.Struct('!B')),
+    ('message_id', 'id',      struct.Struct('!I')),
+    ('seconds',    'seconds', struct.Struct('!H')),
+    ('flags',      'flags',   struct.Struct('!H')),
+)
+
+#: value -> member tables to skip enum construction when decoding headers
+OPCODES  = OpCode._value2member_map_
+HWTYPES  = HwType._value2member_map_
+
+#: end-of-options marker bound once to skip enum attribute lookups
+END = OptionCode.End
+
+#: default parameters requested by discover/request messages
+DEFAULT_PARAMS = (
+    OptionCode.SubnetMask,
+    OptionCode.BroadcastAddress,
+    OptionCode.TimeOffset,
+    OptionCode.Router,
+    OptionCode.DomainName,
+    OptionCode.DomainNameServer,
+    OptionCode.HostName,
+)
+
 OptionListv4 = OptionList[Option]
 OptionParam  = Union[OptionListv4, Sequence[Option], None]
 
+#** Functions **#
+
+def pack_ipv4(field: str, ipaddr: IPv4Address) -> bytes:
+    """
+    pack message header address (coercing non ipv4-address values)
+
+    :param field:  header field name used in error messages
+    :param ipaddr: header ipv4-address value
+    :return:       packed 4-byte ipv4-address
+    """
+    if type(ipaddr) is not IPv4Address:
+        try:
+            ipaddr = IPv4Address(ipaddr)
+        except ValueError as e:
+            raise ValueError(f'MessageHeader.{field}->{e}') from None
+    return ipaddr.packed
+
+def overflow_field(message: 'Message') -> str:
+    """
+    find the first message header integer that does not fit its layout
+
+    :param message: message that failed to pack
+    :return:        header field name of the out-of-range value
+    """
+    for name, attr, layout in HEADER_INTS:
+        try:
+            layout.pack(getattr(message, attr))
+        except struct.error:
+            return name
+    return 'header'
+
+def decode_enum(field: str, table: dict, enum: type, value: int):
+    """
+    convert raw message header value into its enum member
+
+    :param field: header field name used in error messages
+    :param table: value -> member lookup table for enum
+    :param enum:  enum type to fall back on for values missing from table
+    :param value: raw header value
+    :return:      enum member for value
+    """
+    member = table.get(value)
+    if member is None:
+        try:
+            member = enum(value)
+        except ValueError as e:
+            raise ValueError(f'MessageHeader.{field}->{e}') from None
+    return member
+
 #** Classes **#
 
 class HexBytes(bytes):
     def __repr__(self) -> str:
         return f'0x{self.hex()}'
 
-class MessageHeader(Struct):
-    opcode:       Annotated[OpCode, U8]
-    hw_type:      Annotated[HwType, U8]
-    hw_length:    U8
-    hops:         U8
-    message_id:   U32
-    seconds:      U16
-    flags:        U16
-    client_addr:  IPv4
-    your_addr:    IPv4
-    server_addr:  IPv4
-    gateway_addr: IPv4
-    hw_addr:      Annotated[HexBytes, StaticBytes(16)]
-    server_name:  Annotated[bytes, StaticBytes(64)]
-    boot_file:    Annotated[bytes, StaticBytes(128)]
-    magic_cookie: Annotated[bytes, Const(MAGIC_COOKIE)] = MAGIC_COOKIE
-
 @dataclass(slots=True)
 class Message:
     """
@@ -141,15 +210,7 @@ class Message:
             client_hw=hwaddr,
             options=OptionList([
                 DHCPMessageType(MessageType.Discover),
-                ParamRequestList([
-                    OptionCode.SubnetMask,
-                    OptionCode.BroadcastAddress,
-                    OptionCode.TimeOffset,
-                    OptionCode.Router,
-                    OptionCode.DomainName,
-                    OptionCode.DomainNameServer,
-                    OptionCode.HostName,
-                ]),
+                ParamRequestList(list(DEFAULT_PARAMS)),
                 *ops
             ]),
             **kwargs
@@ -185,15 +246,7 @@ class Message:
             options=OptionList([
                 DHCPMessageType(MessageType.Request),
                 RequestedIPAddr(ipaddr),
-                ParamRequestList([
-                    OptionCode.SubnetMask,
-                    OptionCode.BroadcastAddress,
-                    OptionCode.TimeOffset,
-                    OptionCode.Router,
-                    OptionCode.DomainName,
-                    OptionCode.DomainNameServer,
-                    OptionCode.HostName,
-                ]),
+                ParamRequestList(list(DEFAULT_PARAMS)),
                 *ops,
             ]),
             **kwargs,
@@ -207,7 +260,7 @@ class Message:
         :param kwargs:  additional settings for message generation
         :return:        new generated message reply object
         """
-        ops: OptionListv4 = OptionList(options or [])
+        ops: OptionListv4 = OptionList(options) if options else OptionList()
         return Message(
             op=OpCode.BootReply,
             id=self.id,
@@ -224,29 +277,72 @@ class Message:
         :param ctx: serialization context object
         :return:    serialized bytes
         """
-        ctx   = ctx or Context()
-        data  = bytearray()
-        data += MessageHeader(
-            opcode=self.op,
-            hw_type=self.hw_type,
-            hw_length=len(self.client_hw),
-            hops=self.hops,
-            message_id=self.id,
-            seconds=self.seconds,
-            flags=self.flags,
-            client_addr=self.client_addr,
-            your_addr=self.your_addr,
-            server_addr=self.server_addr,
-            gateway_addr=self.gateway_addr,
-            hw_addr=cast(HexBytes, self.client_hw),
-            server_name=self.server_name,
-            boot_file=self.boot_file,
-        ).pack(ctx)
-        data += b''.join(pack_option(op, ctx) for op in self.options)
-        if not any(op.opcode == OptionCode.End for op in self.options):
-            data += bytes((OptionCode.End, ))
+        if len(self.client_hw) > 16 \
+            or len(self.server_name) > 64 \
+            or len(self.boot_file) > 128:
+            raise OverflowError('message header field exceeds maximum length')
+        ctx  = ctx or Context()
+        data = bytearray(HEADER.size)
+        try:
+            HEADER.pack_into(data, 0,
+                self.op,
+                self.hw_type,
+                len(self.client_hw),
+                self.hops,
+                self.id,
+                self.seconds,
+                self.flags,
+                pack_ipv4('client_addr', self.client_addr),
+                pack_ipv4('your_addr', self.your_addr),
+                pack_ipv4('server_addr', self.server_addr),
+                pack_ipv4('gateway_addr', self.gateway_addr),
+                self.client_hw,
+                self.server_name,
+                self.boot_file,
+                MAGIC_COOKIE,
+            )
+        except struct.error as e:
+            field = overflow_field(self)
+            raise OverflowError(f'MessageHeader.{field}->{e}') from None
+        ctx.index += HEADER.size
+        # write option headers and content directly into message buffer
+        subctx = Context()
+        for option in self.options:
+            pack_option_into(option, data, ctx, subctx)
+        if END not in self.options:
+            data.append(END)
         return bytes(data)
 
+    @staticmethod
+    def peek(raw: bytes) -> Tuple[OpCode, int, Optional[MessageType]]:
+        """
+        read message op, transaction-id and message-type without full unpack
+
+        :param raw: raw byte buffer
+        :return:    (op, transaction-id, message-type) of the raw message
+        """
+        if len(raw) < HEADER.size:
+            raise ValueError('too little data to unpack message header')
+        op       = raw[0]
+        xid      = int.from_bytes(raw[4:8], 'big')
+        span     = find_option(raw, OptionCode.DHCPMessageType, HEADER.size)
+        mtype    = None
+        if span is not None and span[2] - span[1] == 1:
+            mtype = MTYPES.get(raw[span[1]])
+        return decode_enum('opcode', OPCODES, OpCode, op), xid, mtype
+
+    @staticmethod
+    def peek_id(raw: bytes) -> int:
+        """
+        read message transaction-id from raw bytes without a full unpack
+
+        :param raw: raw byte buffer
+        :return:    message transaction-id
+        """
+        if len(raw) < 8:
+            raise ValueError('too little data to read message id')
+        return int.from_bytes(raw[4:8], 'big')
+
     @classmethod
     def unpack(cls, raw: bytes, ctx: Optional[Context] = None) -> Self:
         """
@@ -256,24 +352,36 @@ class Message:
         :param ctx: deserialization context object
         :return:    unpacked message object
         """
-        ctx     = ctx or Context()
-        header  = MessageHeader.unpack(raw, ctx)
-        options = []
-        while raw[ctx.index] not in (0, OptionCode.End):
-            option = unpack_option(raw, ctx)
-            options.append(option)
+        index = ctx.index if ctx is not None else 0
+        if len(raw) - index < HEADER.size:
+            raise ValueError('too little data to unpack message header')
+        (
+            op, hw_type, _, hops, message_id, seconds, flags,
+            client_addr, your_addr, _, gateway_addr,
+            hw_addr, server_name, boot_file, magic_cookie,
+        ) = HEADER.unpack_from(raw, index)
+        if magic_cookie != MAGIC_COOKIE:
+            raise ValueError(f'invalid magic cookie: {magic_cookie!r}')
+        spans, index = scan_options(raw, index + HEADER.size)
+        if ctx is not None:
+            ctx.index = index
+        subctx  = Context()
+        options = [
+            decode_option(opcode, raw[start:end], subctx)
+            for opcode, start, end in spans
+        ]
         return cls(
-            op=header.opcode,
-            id=header.message_id,
-            client_hw=header.hw_addr,
-            options=OptionList(options),
-            hw_type=header.hw_type,
-            hops=header.hops,
-            seconds=header.seconds,
-            flags=header.flags,
-            client_addr=header.client_addr,
-            your_addr=header.your_addr,
-            gateway_addr=header.gateway_addr,
-            server_name=header.server_name,
-            boot_file=header.boot_file,
+            op=decode_enum('opcode', OPCODES, OpCode, op),
+            id=message_id,
+            client_hw=HexBytes(hw_addr.rstrip(b'\x00')),
+            options=OptionList.from_list(options),
+            hw_type=decode_enum('hw_type', HWTYPES, HwType, hw_type),
+            hops=hops,
+            seconds=seconds,
+            flags=flags,
+            client_addr=decode_ipv4(client_addr),
+            your_addr=decode_ipv4(your_addr),
+            gateway_addr=decode_ipv4(gateway_addr),
+            server_name=server_name.rstrip(b'\x00'),
+            boot_file=boot_file.rstrip(b'\x00'),
         )
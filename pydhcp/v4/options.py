@@ -1,13 +1,15 @@
 """
 DHCPv4 Option Implementations
 """
+import struct
 from functools import lru_cache
-from typing import ClassVar, List, Optional, Type
+from ipaddress import IPv4Address
+from typing import ClassVar, Dict, Iterator, List, Optional, Tuple, Type
 from typing_extensions import Annotated, Self
 
 from pystructs import (
     I32, U16, U32, U8, Context, Domain, GreedyBytes,
-    GreedyList, HintedBytes, IPv4, Struct)
+    GreedyList, IPv4, Struct)
 
 from ..abc import DHCPOption
 from ..enum import Arch, StatusCode
@@ -58,33 +60,184 @@ __all__ = [
 ByteContent   = Annotated[bytes, GreedyBytes()]
 OptionCodeInt = Annotated[OptionCode, U8]
 
+#: option content span within a raw buffer (opcode, start, end)
+Span = Tuple[int, int, int]
+
+#: single-byte padding and end-of-options markers within the options section
+OPTION_PAD = int(OptionCode.OptionPad)
+OPTION_END = int(OptionCode.End)
+
+#: precompiled layouts for fixed-size integer options
+U16_LAYOUT = struct.Struct('!H')
+U32_LAYOUT = struct.Struct('!I')
+I32_LAYOUT = struct.Struct('!i')
+
+#: value -> member tables to skip enum construction when decoding options
+ARCHES = Arch._value2member_map_
+MTYPES = MessageType._value2member_map_
+
+#: opcode -> option type registry populated as option classes are defined
+OPTION_MAP: Dict[int, Type['Option']] = {}
+
+#: opcode indexed lookup table of option types for quick decoding
+OPTION_TABLE: List[Optional[Type['Option']]] = [None] * 256
+
 #** Functions **#
 
 def pack_option(option: 'Option', ctx: Optional[Context] = None) -> bytes:
     """
-    """
-    return OptionHeader(option.opcode, option.pack()).pack(ctx)
-
-def unpack_option(raw: bytes, ctx: Optional[Context] = None) -> 'Option':
-    """
-    """
-    header = OptionHeader.unpack(raw, ctx)
-    oclass = OPTION_MAP.get(header.opcode, None)
-    oclass = oclass or Unknown.new(header.opcode, len(header.option))
-    return oclass.unpack(header.option)
+    pack single option header and content into bytes
+
+    :param option: option object to serialize
+    :param ctx:    serialization context object for message buffer
+    :return:       packed option bytes
+    """
+    buffer = bytearray()
+    pack_option_into(option, buffer, ctx)
+    return bytes(buffer)
+
+def pack_option_into(option: 'Option', buffer: bytearray,
+    ctx: Optional[Context] = None, subctx: Optional[Context] = None):
+    """
+    pack single option header and content directly onto the end of a buffer
+
+    :param option: option object to serialize
+    :param buffer: message buffer to append option to
+    :param ctx:    serialization context object for message buffer
+    :param subctx: reusable context for option content (reset before use)
+    """
+    if subctx is None:
+        subctx = Context()
+    else:
+        subctx.reset()
+    content = option.pack(subctx)
+    if len(content) > 0xFF:
+        raise OverflowError(
+            f'{option.__class__.__name__} content exceeds 255 bytes')
+    buffer.append(option.opcode)
+    buffer.append(len(content))
+    buffer += content
+    if ctx is not None:
+        ctx.index += 2 + len(content)
+
+def unpack_option(raw: bytes,
+    ctx: Optional[Context] = None, subctx: Optional[Context] = None) -> 'Option':
+    """
+    unpack single option header and content from raw bytes
+
+    :param raw:    raw byte buffer
+    :param ctx:    deserialization context object for message buffer
+    :param subctx: reusable context for option content (reset before use)
+    :return:       unpacked option object
+    """
+    index  = ctx.index if ctx is not None else 0
+    length = len(raw)
+    if index + 1 >= length:
+        raise ValueError('too little data to unpack option header')
+    opcode = raw[index]
+    start  = index + 2
+    end    = start + raw[index + 1]
+    if end > length:
+        raise ValueError(
+            f'option({opcode}) too little data to unpack {end - start} bytes')
+    if ctx is not None:
+        ctx.index = end
+    return decode_option(opcode, raw[start:end], subctx)
+
+def decode_option(opcode: int,
+    data: bytes, ctx: Optional[Context] = None) -> 'Option':
+    """
+    decode option content for the specified opcode
+
+    :param opcode: option opcode
+    :param data:   raw option content (excluding option header)
+    :param ctx:    reusable context for option content (reset before use)
+    :return:       unpacked option object
+    """
+    oclass = OPTION_TABLE[opcode] or OPTION_MAP.get(opcode)
+    if oclass is None:
+        oclass = UNKNOWN_TABLE[opcode]
+    if ctx is None:
+        ctx = Context()
+    else:
+        ctx.reset()
+    return oclass.unpack(data, ctx)
+
+def iter_options(raw: bytes, index: int = 0) -> Iterator[Span]:
+    """
+    walk option TLV records without decoding their content
+
+    :param raw:   raw byte buffer
+    :param index: starting index of options section within buffer
+    :return:      iterator of (opcode, start, end) content spans
+    """
+    length = len(raw)
+    while index < length:
+        opcode = raw[index]
+        if opcode == OPTION_PAD:
+            index += 1
+            continue
+        if opcode == OPTION_END:
+            break
+        if index + 1 >= length:
+            raise ValueError(f'option({opcode}) missing length byte')
+        start = index + 2
+        end   = start + raw[index + 1]
+        if end > length:
+            raise ValueError(
+                f'option({opcode}) too little data to unpack {end - start} bytes')
+        yield (opcode, start, end)
+        index = end
+
+def scan_options(raw: bytes, index: int = 0) -> Tuple[List[Span], int]:
+    """
+    collect option TLV content spans without decoding their content
+
+    :param raw:   raw byte buffer
+    :param index: starting index of options section within buffer
+    :return:      (opcode, start, end) content spans and final buffer index
+    """
+    spans = list(iter_options(raw, index))
+    return spans, spans[-1][2] if spans else index
+
+def find_option(raw: bytes, opcode: int, index: int = 0) -> Optional[Span]:
+    """
+    walk option TLV records only until the specified opcode is found
+
+    :param raw:    raw byte buffer
+    :param opcode: option opcode to search for
+    :param index:  starting index of options section within buffer
+    :return:       (opcode, start, end) content span of option (if found)
+    """
+    for span in iter_options(raw, index):
+        if span[0] == opcode:
+            return span
+
+@lru_cache(maxsize=4096)
+def decode_ipv4(raw: bytes) -> IPv4Address:
+    """
+    convert raw packed address into an ipv4-address (cached for repeats)
+
+    :param raw: packed 4-byte ipv4-address
+    :return:    ipv4-address object
+    """
+    return IPv4Address(raw)
 
 #** Classes **#
 
-class OptionHeader(Struct):
-    opcode: OptionCodeInt
-    option: Annotated[bytes, HintedBytes(U8)]
-
 class Option(Struct, DHCPOption):
     """
     Abstract Baseclass for DHCPv4 Option Content
     """
     opcode: ClassVar[OptionCode] #type: ignore
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        opcode = getattr(cls, 'opcode', None)
+        if opcode is not None:
+            OPTION_MAP[opcode]   = cls
+            OPTION_TABLE[opcode] = cls
+
 class _IPv4ListOption(Option):
     """
     BaseClass for AddressList Options
@@ -92,18 +245,88 @@ class _IPv4ListOption(Option):
     opcode: ClassVar[OptionCode]
     ips:    Annotated[List[IPv4], GreedyList(IPv4)]
 
-class SubnetMask(Option):
+    @classmethod
+    def _pack(cls, value: Self, ctx: Context) -> bytes:
+        return ctx.track_bytes(b''.join(ip.packed for ip in value.ips))
+
+    @classmethod
+    def _unpack(cls, raw: bytes, ctx: Context) -> Self:
+        start      = ctx.index
+        count, odd = divmod(len(raw) - start, 4)
+        if odd:
+            raise ValueError(
+                f'{cls.__name__}.ips->too little data to unpack ipv4(4)')
+        ctx.index += count * 4
+        return cls([decode_ipv4(raw[n:n+4]) for n in range(start, ctx.index, 4)])
+
+class _IPv4Option(Option):
+    """
+    BaseClass for Single IPv4Address Options (Fixed 4-Byte Content)
+    """
+    attr: ClassVar[str]
+
+    @classmethod
+    def _pack(cls, value: Self, ctx: Context) -> bytes:
+        ipaddr = getattr(value, cls.attr)
+        if type(ipaddr) is not IPv4Address:
+            try:
+                ipaddr = IPv4Address(ipaddr)
+            except ValueError as e:
+                raise ValueError(f'{cls.__name__}.{cls.attr}->{e}') from None
+        return ctx.track_bytes(ipaddr.packed)
+
+    @classmethod
+    def _unpack(cls, raw: bytes, ctx: Context) -> Self:
+        data = ctx.slice(raw, 4)
+        if len(data) != 4:
+            raise ValueError(
+                f'{cls.__name__}.{cls.attr}->too little data to unpack ipv4(4)')
+        return cls(decode_ipv4(data))
+
+class _IntOption(Option):
+    """
+    BaseClass for Single Integer Options with a Precompiled Struct Layout
+    """
+    attr:   ClassVar[str]
+    layout: ClassVar[struct.Struct]
+
+    @classmethod
+    def _pack(cls, value: Self, ctx: Context) -> bytes:
+        number = getattr(value, cls.attr)
+        try:
+            if type(number) is not int:
+                number = int(number)
+            return ctx.track_bytes(cls.layout.pack(number))
+        except ValueError as e:
+            raise ValueError(f'{cls.__name__}.{cls.attr}->{e}') from None
+        except struct.error as e:
+            raise OverflowError(f'{cls.__name__}.{cls.attr}->{e}') from None
+
+    @classmethod
+    def _unpack(cls, raw: bytes, ctx: Context) -> Self:
+        size = cls.layout.size
+        if len(raw) - ctx.index < size:
+            raise ValueError(f'{cls.__name__}.{cls.attr}->'
+                f'too little data to unpack integer({size})')
+        value = cls.layout.unpack_from(raw, ctx.index)[0]
+        ctx.index += size
+        return cls(value)
+
+class SubnetMask(_IPv4Option):
     """
     SubnetMask (1) - The Subnet Mask to Apply for an Ipv4 Address Assignment
     """
     opcode: ClassVar[OptionCode] = OptionCode.SubnetMask
+    attr:   ClassVar[str]        = 'mask'
     mask:   IPv4
 
-class TimezoneOffset(Option):
+class TimezoneOffset(_IntOption):
     """
     TimezoneOffset (2) - Informs Client of Network Timezone Offset
     """
-    opcode: ClassVar[OptionCode] = OptionCode.TimeOffset
+    opcode: ClassVar[OptionCode]    = OptionCode.TimeOffset
+    attr:   ClassVar[str]           = 'offset'
+    layout: ClassVar[struct.Struct] = I32_LAYOUT
     offset: I32
 
 class Router(_IPv4ListOption):
@@ -162,11 +385,12 @@ class DomainName(Option):
     opcode: ClassVar[OptionCode] = OptionCode.DomainName
     domain: ByteContent
 
-class BroadcastAddr(Option):
+class BroadcastAddr(_IPv4Option):
     """
     BroadCastAddress (28) - Specifies Network Broadcast Address
     """
     opcode: ClassVar[OptionCode] = OptionCode.BroadcastAddress
+    attr:   ClassVar[str]        = 'addr'
     addr:   IPv4
 
 class VendorInfo(Option):
@@ -176,18 +400,21 @@ class VendorInfo(Option):
     opcode: ClassVar[OptionCode] = OptionCode.VendorSpecificInformation
     info:   ByteContent
 
-class RequestedIPAddr(Option):
+class RequestedIPAddr(_IPv4Option):
     """
     Requested IP Address (50) - Client Requested IP Address
     """
     opcode: ClassVar[OptionCode] = OptionCode.RequestedIPAddress
+    attr:   ClassVar[str]        = 'ip'
     ip:     IPv4
 
-class IPLeaseTime(Option):
+class IPLeaseTime(_IntOption):
     """
     IPLeaseTime (51) - Client Requested/Server Assigned Lease Time
     """
-    opcode:  ClassVar[OptionCode] = OptionCode.IPAddressLeaseTime
+    opcode:  ClassVar[OptionCode]    = OptionCode.IPAddressLeaseTime
+    attr:    ClassVar[str]           = 'seconds'
+    layout:  ClassVar[struct.Struct] = U32_LAYOUT
     seconds: U32
 
 class DHCPMessageType(Option):
@@ -197,11 +424,24 @@ class DHCPMessageType(Option):
     opcode: ClassVar[OptionCode] = OptionCode.DHCPMessageType
     mtype:  Annotated[MessageType, U8]
 
-class ServerIdentifier(Option):
+    @classmethod
+    def _unpack(cls, raw: bytes, ctx: Context) -> Self:
+        if ctx.index >= len(raw):
+            raise ValueError(
+                f'{cls.__name__}.mtype->too little data to unpack integer(1)')
+        value = raw[ctx.index]
+        ctx.index += 1
+        try:
+            return cls(MTYPES.get(value) or MessageType(value))
+        except ValueError as e:
+            raise ValueError(f'{cls.__name__}.mtype->{e}') from None
+
+class ServerIdentifier(_IPv4Option):
     """
     DHCP Server Identifier (54) - Identifies DHCP Server Subject
     """
     opcode: ClassVar[OptionCode] = OptionCode.ServerIdentifier
+    attr:   ClassVar[str]        = 'ip'
     ip:     IPv4
 
 class ParamRequestList(Option):
@@ -211,6 +451,20 @@ class ParamRequestList(Option):
     opcode: ClassVar[OptionCode] = OptionCode.ParameterRequestList
     params: Annotated[List[OptionCode], GreedyList(OptionCodeInt)]
 
+    @classmethod
+    def _unpack(cls, raw: bytes, ctx: Context) -> Self:
+        data   = ctx.slice(raw, len(raw) - ctx.index)
+        params = []
+        try:
+            for n in data:
+                code = OPTION_CODES[n]
+                if code is None:
+                    code = OptionCode(n)
+                params.append(code)
+        except ValueError as e:
+            raise ValueError(f'{cls.__name__}.params->{e}') from None
+        return cls(params)
+
 class DHCPMessage(Option):
     """
     Server Message (56) - DCHP Message on Server Error / Rejection
@@ -218,25 +472,31 @@ class DHCPMessage(Option):
     opcode:  ClassVar[OptionCode] = OptionCode.Message
     message: ByteContent
 
-class MaxMessageSize(Option):
+class MaxMessageSize(_IntOption):
     """
     DHCP Max Message Size (57) - Maximum Length Packet Sender will Accept
     """
-    opcode: ClassVar[OptionCode] = OptionCode.Message
+    opcode: ClassVar[OptionCode]    = OptionCode.MaximumDHCPMessageSize
+    attr:   ClassVar[str]           = 'size'
+    layout: ClassVar[struct.Struct] = U16_LAYOUT
     size:   U16
 
-class RenewalTime(Option):
+class RenewalTime(_IntOption):
     """
     DHCP Renewal Time (58) - Client Address Renewal Interval
     """
-    opcode:  ClassVar[OptionCode] = OptionCode.RenewTimeValue
+    opcode:  ClassVar[OptionCode]    = OptionCode.RenewTimeValue
+    attr:    ClassVar[str]           = 'seconds'
+    layout:  ClassVar[struct.Struct] = U32_LAYOUT
     seconds: U32
 
-class RebindTime(Option):
+class RebindTime(_IntOption):
     """
     DHCP Rebind Time (59) - Client Address Rebind Interval
     """
-    opcode:  ClassVar[OptionCode] = OptionCode.RebindingTimeValue
+    opcode:  ClassVar[OptionCode]    = OptionCode.RebindingTimeValue
+    attr:    ClassVar[str]           = 'seconds'
+    layout:  ClassVar[struct.Struct] = U32_LAYOUT
     seconds: U32
 
 class VendorClassIdentifier(Option):
@@ -267,6 +527,25 @@ class ClientSystemArch(Option):
     opcode: ClassVar[OptionCode] = OptionCode.ClientSystemArchitectureType
     arches: Annotated[List[Arch], GreedyList(Annotated[Arch, U16])]
 
+    @classmethod
+    def _unpack(cls, raw: bytes, ctx: Context) -> Self:
+        count, odd = divmod(len(raw) - ctx.index, 2)
+        if odd:
+            raise ValueError(
+                f'{cls.__name__}.arches->too little data to unpack integer(2)')
+        values = struct.unpack_from(f'!{count}H', raw, ctx.index)
+        ctx.index += count * 2
+        arches = []
+        try:
+            for n in values:
+                arch = ARCHES.get(n)
+                if arch is None:
+                    arch = Arch(n)
+                arches.append(arch)
+        except ValueError as e:
+            raise ValueError(f'{cls.__name__}.arches->{e}') from None
+        return cls(arches)
+
 class DNSDomainSearchList(Option):
     """
     DNS Domain Search List (119) - List of DNS Search Domain Suffixes (RFC 3397)
@@ -293,7 +572,7 @@ class PXEPathPrefix(Option):
     """
     PXE Server Path Prefix (210) - PXELINUX TFTP Path Prefix (RFC 5071)
     """
-    opcode: ClassVar[OptionCode] = OptionCode.TFTPServerIPAddress
+    opcode: ClassVar[OptionCode] = OptionCode.PXELinuxPathPrefix
     prefix: ByteContent
 
 class End(Option):
@@ -309,7 +588,7 @@ class Unknown:
     __slots__ = ('data', )
 
     opcode: ClassVar[OptionCode]
-    size:   ClassVar[int]
+    size:   ClassVar[Optional[int]] = None
 
     def __init__(self, data: bytes):
         self.data = data
@@ -323,17 +602,20 @@ class Unknown:
 
     @classmethod
     def unpack(cls, raw: bytes, ctx: Optional[Context] = None) -> Self:
-        ctx = ctx or Context()
-        return cls(ctx.slice(raw, cls.size))
+        ctx  = ctx or Context()
+        size = len(raw) - ctx.index if cls.size is None else cls.size
+        return cls(ctx.slice(raw, size))
 
     @classmethod
     @lru_cache(maxsize=None)
-    def new(cls, opcode: OptionCode, size: int) -> Type:
+    def new(cls, opcode: OptionCode, size: Optional[int] = None) -> Type:
         return type('Unknown', (cls, ), {'opcode': opcode, 'size': size})
 
 #** Init **#
 
-#: cheeky way of collecting all option types into map based on their OptionCode
-OPTION_MAP = {v.opcode:v
-    for v in globals().values()
-    if isinstance(v, type) and issubclass(v, Option) and hasattr(v, 'opcode')}
+#: opcode indexed table of known option-codes for naming unknown options
+OPTION_CODES = tuple(OptionCode._value2member_map_.get(n) for n in range(256))
+
+#: opcode indexed table of greedy unknown option types for fallback decoding
+UNKNOWN_TABLE = tuple(Unknown.new(n if code is None else code)
+    for n, code in enumerate(OPTION_CODES))
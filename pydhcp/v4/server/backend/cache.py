@@ -1,12 +1,15 @@
 """
 Backend Extension to support In-Memory Answer Caching
 """
+from collections import OrderedDict
 from copy import copy
 from ipaddress import IPv4Address
-from datetime import datetime, timedelta
+from datetime import timedelta
 from logging import Logger, getLogger
+from math import ceil
 from threading import Lock
-from typing import ClassVar, Dict, Optional, Set
+from time import monotonic
+from typing import ClassVar, Optional, Set
 
 from pyderive import InitVar, dataclass, field
 
@@ -28,30 +31,34 @@ class CacheRecord:
     """
     answer:    SimpleAnswer
     lifetime:  timedelta
-    expires:   datetime = field(init=False)
-    accessed:  datetime = field(init=False)
+    expires:   float = field(init=False)
+    ends:      float = field(init=False)
+    served:    int   = field(init=False)
 
     def __post_init__(self):
         """
-        calculate expiration-time and last-accessed time
+        calculate expiration-time and lease end-time (monotonic seconds)
         """
-        lease = self.answer.lease
-        ttl   = min(lease, self.lifetime)
-        now   = datetime.now()
-        self.expires  = now + ttl
-        self.accessed = now
+        lease = self.answer.lease.total_seconds()
+        life  = self.lifetime.total_seconds()
+        now   = monotonic()
+        # expire once lifetime passes or remaining lease drops to lifetime
+        self.expires = now + min(life, lease - life)
+        self.ends    = now + lease
+        self.served  = ceil(lease)
 
     def is_expired(self) -> bool:
         """
-        calculate if expiration has passed or ttl is expired
+        calculate if expiration has passed and update remaining lease
         """
-        now = datetime.now()
+        now = monotonic()
         if self.expires <= now:
             return True
-        self.answer.lease -= now - self.accessed
-        if self.answer.lease <= self.lifetime:
-            return True
-        self.accessed = now
+        # remaining lease is served in whole seconds, so only rebuild on change
+        remaining = ceil(self.ends - now)
+        if remaining != self.served:
+            self.served       = remaining
+            self.answer.lease = timedelta(0, remaining)
         return False
 
 @dataclass(slots=True)
@@ -67,8 +74,8 @@ class CacheBackend(SimpleBackend):
     ignore_sources: Set[str]  = field(default_factory=lambda: IGNORE)
     logger:         Logger    = field(default_factory=lambda: getLogger('pydhcp'))
 
-    mutex:       Lock                   = field(default_factory=Lock, init=False)
-    cache:       Dict[str, CacheRecord] = field(default_factory=dict, init=False)
+    mutex: Lock                            = field(default_factory=Lock, init=False)
+    cache: 'OrderedDict[str, CacheRecord]' = field(default_factory=OrderedDict, init=False)
 
     def __post_init__(self):
         self.logger = self.logger.getChild('cache')
@@ -81,14 +88,18 @@ class CacheBackend(SimpleBackend):
         :return:    ip-assignment answer stored in cache
         """
         mac = clean_mac(mac)
+        # membership is atomic on dict, so misses skip the mutex entirely
+        if mac not in self.cache:
+            return
         with self.mutex:
-            if mac not in self.cache:
+            record = self.cache.pop(mac, None)
+            if record is None:
                 return
-            record = self.cache[mac]
             if record.is_expired():
-                self.logger.debug(f'{mac} expired')
-                del self.cache[mac]
+                self.logger.debug('%s expired', mac)
                 return
+            # re-insert to mark as most-recently used
+            self.cache[mac] = record
             return record.answer
 
     def set_cache(self, mac: str, answer: SimpleAnswer):
@@ -98,14 +109,19 @@ class CacheBackend(SimpleBackend):
         :param mac:    mac-address key linked to answer
         :param answer: ip-assignment answer to store in cache
         """
-        mac = clean_mac(mac)
+        mac           = clean_mac(mac)
+        answer        = copy(answer)
+        answer.source = self.source
+        record        = CacheRecord(answer, self.expiration)
         with self.mutex:
-            if len(self.cache) >= self.maxsize:
-                self.logger.debug(f'maxsize: {self.maxsize} exceeded. clearing cache!')
-                self.cache.clear()
-            answer        = copy(answer)
-            answer.source = self.source
-            self.cache[mac] = CacheRecord(answer, self.expiration)
+            if mac in self.cache:
+                self.cache.move_to_end(mac)
+            elif len(self.cache) >= self.maxsize:
+                # evict least-recently used record to make room
+                oldest, _ = self.cache.popitem(last=False)
+                self.logger.debug(
+                    'maxsize: %d exceeded. evicted %s', self.maxsize, oldest)
+            self.cache[mac] = record
 
     def request_address(self,
         mac: str, ipv4: Optional[IPv4Address]) -> Optional[SimpleAnswer]:
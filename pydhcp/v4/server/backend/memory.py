@@ -1,11 +1,14 @@
 """
 Example Memory Based Backend for DHCP Server
 """
+from bisect import bisect_left, insort
 from datetime import datetime, timedelta
+from functools import lru_cache
+from heapq import heapify, heappop, heappush
 from ipaddress import IPv4Address, IPv4Interface, IPv4Network
 from logging import Logger, getLogger
 from threading import Lock
-from typing import ClassVar, Dict, Iterator, List, Optional
+from typing import ClassVar, Dict, Iterator, List, Optional, Set, Tuple
 
 from pyderive import dataclass
 from pyderive.extensions.serde import field
@@ -19,6 +22,9 @@ __all__ = ['MemoryBackend']
 #: default lease assignment for dhcp memory-backend
 DEFAULT_LEASE = timedelta(seconds=3600)
 
+#: translation table to strip mac-address separators
+MAC_STRIP = str.maketrans('', '', ':-')
+
 #** Functions **#
 
 def clean_mac(mac: str) -> str:
@@ -28,7 +34,18 @@ def clean_mac(mac: str) -> str:
     :param mac: mac-address to clean
     :return:    cleaned mac-address
     """
-    return mac.lower().replace(':', '').replace('-', '')
+    return mac.translate(MAC_STRIP).lower()
+
+@lru_cache(maxsize=4096)
+def make_interface(ipaddr: IPv4Address, prefixlen: int) -> IPv4Interface:
+    """
+    build ip-interface for an address within a network (cached for repeats)
+
+    :param ipaddr:    ip-address of the interface
+    :param prefixlen: prefix-length of the containing network
+    :return:          ip-interface for the address
+    """
+    return IPv4Interface((ipaddr, prefixlen))
 
 #** Classes **#
 
@@ -69,9 +86,14 @@ class MemoryBackend(SimpleBackend):
 
     addresses: Iterator[IPv4Address] = field(init=False)
     reclaimed: List[IPv4Interface]   = field(init=False, default_factory=list)
+    pooled:    Set[IPv4Interface]    = field(init=False, default_factory=set)
+    reserved:  Set[IPv4Address]      = field(init=False, default_factory=set)
+
+    expiry: List[Tuple[datetime, str]] = field(init=False, default_factory=list)
 
     def __post_init__(self):
         self.addresses = self.network.hosts()
+        self.reserved  = {self.gateway, *self.dns}
 
     def set_static(self, mac: str, ipaddr: IPv4Address, **settings):
         """
@@ -83,20 +105,47 @@ class MemoryBackend(SimpleBackend):
         """
         if ipaddr not in self.network:
             raise ValueError(f'{ipaddr} not within {self.network}')
-        mac  = clean_mac(mac)
-        ipv4 = IPv4Interface(f'{ipaddr}/{self.network.netmask}')
+        mac      = clean_mac(mac)
+        ipv4     = make_interface(ipaddr, self.network.prefixlen)
+        previous = self.static.get(mac)
         self.static[mac] = IPRecord(ipv4, **settings)
-
-    def _reclaim_all(self):
+        # release previous static address unless still reserved elsewhere
+        if previous is not None and previous.ipv4.ip != ipv4.ip:
+            old = previous.ipv4.ip
+            if old not in (self.gateway, *self.dns) \
+                and all(r.ipv4.ip != old for r in self.static.values()):
+                self.reserved.discard(old)
+        self.reserved.add(ipv4.ip)
+
+    def _reclaim_all(self, now: Optional[datetime] = None):
         """
         reclaim addresses from expired dhcp leases
+
+        :param now: current time to compare lease expirations against
+        """
+        now    = now or datetime.now()
+        expiry = self.expiry
+        while expiry and expiry[0][0] <= now:
+            expires, mac = heappop(expiry)
+            # skip entries left behind by released or replaced records
+            record = self.records.get(mac)
+            if record is None or record.expires != expires:
+                continue
+            del self.records[mac]
+            insort(self.reclaimed, record.record.ipv4)
+            self.pooled.add(record.record.ipv4)
+
+    def _track_expiry(self, mac: str, expires: datetime):
         """
-        now   = datetime.now()
-        clean = [mac for mac, r in self.records.items() if r.expires <= now]
-        for mac in clean:
-            record = self.records.pop(mac)
-            self.reclaimed.append(record.record.ipv4)
-        self.reclaimed.sort()
+        schedule record expiration for reclaim (compacting stale entries)
+
+        :param mac:     mac-address linked to record
+        :param expires: expiration time of the record
+        """
+        heappush(self.expiry, (expires, mac))
+        if len(self.expiry) > 2 * len(self.records) + 64:
+            self.expiry = [(r.expires, m) for m, r in self.records.items()]
+            heapify(self.expiry)
 
     def _reclaim_address(self, mac: str):
         """
@@ -106,18 +155,19 @@ class MemoryBackend(SimpleBackend):
         """
         record = self.records.pop(mac, None)
         if record is not None:
-            self.reclaimed.append(record.record.ipv4)
+            insort(self.reclaimed, record.record.ipv4)
+            self.pooled.add(record.record.ipv4)
 
-    def _next_ip(self,
-        mac: str, ipv4: Optional[IPv4Address]) -> Optional[IPv4Interface]:
+    def _next_ip(self, mac: str,
+        ipv4: Optional[IPv4Address], now: datetime) -> Optional[IPv4Interface]:
         """
         retrieve ip-assignment based on dhcp request and database
 
         :param request: dhcp request message
+        :param now:     current time to compare lease expirations against
         :return:        ip-address assignment (if address available)
         """
         # check if client has existing assignment
-        now    = datetime.now()
         record = self.records.get(mac)
         if record is not None and record.expires >= now:
             # extend existing lease and return (if exists)
@@ -126,38 +176,43 @@ class MemoryBackend(SimpleBackend):
             return record.record.ipv4
         # check if requested-ip is available
         if ipv4 is not None:
-            addr = IPv4Interface(f'{ipv4}/{self.network.netmask}')
-            if addr in self.reclaimed:
-                self.reclaimed.remove(addr)
+            addr = make_interface(ipv4, self.network.prefixlen)
+            if addr in self.pooled:
+                self.pooled.discard(addr)
+                del self.reclaimed[bisect_left(self.reclaimed, addr)]
                 return addr
         # retrieve first available in reclaimed or next in hostlist
         if self.reclaimed:
-            return self.reclaimed.pop(0)
+            addr = self.reclaimed.pop(0)
+            self.pooled.discard(addr)
+            return addr
         # retrieve next ip in host-list (skipping reserved ips)
         try:
-            ipaddr    = None
-            reserved  = {r.ipv4.ip for r in self.static.values()}
-            reserved |= set([self.gateway, *self.dns])
+            ipaddr   = None
+            reserved = self.reserved
             while ipaddr is None or ipaddr in reserved:
                 ipaddr = next(self.addresses)
-            return IPv4Interface(f'{ipaddr}/{self.network.netmask}')
+            return make_interface(ipaddr, self.network.prefixlen)
         except StopIteration:
             return
 
     def request_address(self,
         mac: str, ipv4: Optional[IPv4Address]) -> Optional[SimpleAnswer]:
         with self.lock:
-            self._reclaim_all()
+            now = datetime.now()
+            self._reclaim_all(now)
             # retrieve assignment from static or retirve available ip-address
             record = self.static.get(mac)
             if record is None:
-                address = self._next_ip(mac, ipv4)
+                address = self._next_ip(mac, ipv4, now)
                 record  = IPRecord(address) if address else record
             if record is None:
                 return
             # assign record to database and return assignment
-            lease = record.lease or self.default_lease
-            self.records[mac] = Record(record, datetime.now() + lease)
+            lease   = record.lease or self.default_lease
+            expires = now + lease
+            self.records[mac] = Record(record, expires)
+            self._track_expiry(mac, expires)
             return SimpleAnswer(
                 source=self.source,
                 lease=lease,
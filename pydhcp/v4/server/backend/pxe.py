@@ -3,7 +3,7 @@ DHCP PXE TFTP Assignment Backend
 """
 from copy import copy
 from ipaddress import IPv4Address
-from logging import Logger, getLogger
+from logging import INFO, Logger, getLogger
 from typing import Any, ClassVar, Dict, Optional
 from typing_extensions import Annotated
 
@@ -12,6 +12,7 @@ from pyderive.extensions.validate import BaseModel, Validator
 
 from . import Address, Answer, Backend
 from ... import *
+from ...options import ARCHES
 from .... import Arch
 
 #** Variables **#
@@ -32,13 +33,14 @@ def arch_validator(arch: Any) -> Arch:
     """
     pyderive Arch validator function
     """
+    if isinstance(arch, Arch):
+        return arch
     if isinstance(arch, int):
-        return Arch(arch)
+        member = ARCHES.get(arch)
+        return Arch(arch) if member is None else member
     if isinstance(arch, str):
         return Arch[arch]
-    if isinstance(arch, Arch):
-        return arch
-    raise ValueError('Invalid Arch: {arch!r}')
+    raise ValueError(f'Invalid Arch: {arch!r}')
 
 #** Classes **#
 
@@ -108,7 +110,7 @@ class PXEBackend(Backend):
         vendor = request.options.get(VendorClassIdentifier)
         # attempt to retrieve dynamic sub-config based on arch
         if arches and self.config.dynamic.arches:
-            self.logger.debug(f'{hwaddr} arches={arches!r}')
+            self.logger.debug('%s arches=%r', hwaddr, arches)
             for arch in arches.arches:
                 subcfg = self.config.dynamic.arches.get(arch)
                 if subcfg is not None:
@@ -116,12 +118,12 @@ class PXEBackend(Backend):
         # attempt to retrieve dynamic sub-config based on vendor
         if not subcfg and vendor and self.config.dynamic:
             vendor = vendor.vendor.decode()
-            self.logger.debug(f'{hwaddr} vendor={vendor!r}')
+            self.logger.debug('%s vendor=%r', hwaddr, vendor)
             for vendor_id, match in self.config.dynamic.vendors.items():
                 if match in vendor:
                     subcfg = self.config.dynamic.configs.get(vendor_id)
                     self.logger.debug(
-                        f'{hwaddr} vendor match {vendor_id} {match}')
+                        '%s vendor match %s %s', hwaddr, vendor_id, match)
                     if subcfg:
                         break
         # override primary config with subconfig (if exists)
@@ -153,24 +155,29 @@ class PXEBackend(Backend):
         hwaddr = request.client_hw.hex()
         config = self.get_pxe_config(hwaddr, request)
         # build DHCP options based on configuration
-        message  = [f'{address[0]}:{address[1]} | {hwaddr}']
         response = response or request.reply()
         response.server_addr = config.ipaddr
         response.options.append(TFTPServerIP(config.ipaddr.packed))
-        message.append(f'-> pxe={str(config.ipaddr)}')
         if config.primary:
             response.boot_file   = config.filename or response.boot_file
             response.server_name = config.hostname or response.server_name
         if config.prefix:
-            message.append(f'root={config.prefix.decode()!r}')
             response.options.append(PXEPathPrefix(config.prefix))
         if config.hostname:
-            message.append(f'host={config.hostname.decode()!r}')
             response.options.append(TFTPServerName(config.hostname))
         if config.filename:
-            message.append(f'file={config.filename.decode()!r}')
             response.options.append(BootfileName(config.filename + b'\x00'))
-        self.logger.info(' '.join(message))
+        # only render assignment summary when it will actually be logged
+        if self.logger.isEnabledFor(INFO):
+            message = [f'{address[0]}:{address[1]} | {hwaddr}']
+            message.append(f'-> pxe={str(config.ipaddr)}')
+            if config.prefix:
+                message.append(f'root={config.prefix.decode()!r}')
+            if config.hostname:
+                message.append(f'host={config.hostname.decode()!r}')
+            if config.filename:
+                message.append(f'file={config.filename.decode()!r}')
+            self.logger.info(' '.join(message))
         return response
 
     def discover(self, address: Address, request: Message) -> Optional[Answer]:
@@ -4,7 +4,7 @@ Simplified DHCP Backend Protocol for IP-Assignments ONLY
 from abc import abstractmethod
 from datetime import timedelta
 from ipaddress import IPv4Address, IPv4Interface
-from logging import Logger
+from logging import INFO, Logger
 from typing import ClassVar, List, Optional, Protocol
 
 from pyderive import field
@@ -75,12 +75,13 @@ class SimpleBackend(Backend, Protocol):
                     value=StatusCode.NoAddrsAvail,
                     message=b'all addresses in use')])
         lease = int(assign.lease.total_seconds())
-        self.logger.info(
-            f'{address[0]} | {mac} -> ip={assign.ipv4} '
-            f'gw={",".join(str(ip) for ip in assign.routers)} '
-            f'dns={",".join(str(ip) for ip in assign.dns)} '
-            f'lease={lease} source={assign.source}'
-        )
+        if self.logger.isEnabledFor(INFO):
+            self.logger.info(
+                f'{address[0]} | {mac} -> ip={assign.ipv4} '
+                f'gw={",".join(str(ip) for ip in assign.routers)} '
+                f'dns={",".join(str(ip) for ip in assign.dns)} '
+                f'lease={lease} source={assign.source}'
+            )
         return request.reply(
             your_addr=assign.ipv4.ip,
             options=[
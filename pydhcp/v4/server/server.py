@@ -1,6 +1,7 @@
 """
 Simple and Extensible DHCP Server Implementation
 """
+from functools import lru_cache
 from ipaddress import IPv4Address
 from logging import Logger, getLogger
 from typing import Optional, cast
@@ -21,9 +22,31 @@ __all__ = ['Server']
 #: dhcp response port
 PORT = 68
 
+#: minimum bootp message size (replies are zero-padded at the end)
+MIN_SIZE = 300
+
+#: unassigned client source address as reported by the socket
+ZERO_HOST = str(ZeroIp)
+
 #: broadcast request for responding to messages
 BROADCAST = IPv4Address('255.255.255.255')
 
+#: shared message-type options included in server responses
+#: (read-only: the same instance lands in every response, so replace the
+#: option on a response instead of editing these in-place)
+OFFER = DHCPMessageType(MessageType.Offer)
+ACK   = DHCPMessageType(MessageType.Ack)
+NAK   = DHCPMessageType(MessageType.Nak)
+
+#: dispatch table of message-types to their session handler method names
+HANDLERS = {
+    MessageType.Discover: 'process_discover',
+    MessageType.Request:  'process_request',
+    MessageType.Decline:  'process_decline',
+    MessageType.Release:  'process_release',
+    MessageType.Inform:   'process_inform',
+}
+
 #** Function **#
 
 def assign_zero(original: IPv4Address, new: IPv4Address) -> IPv4Address:
@@ -36,6 +59,19 @@ def assign_zero(original: IPv4Address, new: IPv4Address) -> IPv4Address:
     """
     return new if original == ZeroIp else original
 
+@lru_cache(maxsize=None)
+def server_identifier(server_id: IPv4Address) -> ServerIdentifier:
+    """
+    retrieve shared server-identifier option for the specified server address
+
+    NOTE: the option is reused across every response and must be treated
+    as read-only; replace it on a response rather than editing its `ip`
+
+    :param server_id: dhcp server address
+    :return:          shared (read-only) server-identifier option
+    """
+    return ServerIdentifier(server_id)
+
 #** Classes **#
 
 @dataclass
@@ -62,8 +98,8 @@ class Server(BaseSession):
             return
         response = answer.message
         response.server_addr = assign_zero(response.server_addr, self.server_id)
-        response.options.insert(0, DHCPMessageType(MessageType.Offer))
-        response.options.insert(1, ServerIdentifier(self.server_id))
+        response.options.insert(0, OFFER)
+        response.options.insert(1, server_identifier(self.server_id))
         return response
 
     def process_request(self, request: Message) -> Optional[Message]:
@@ -76,15 +112,15 @@ class Server(BaseSession):
         # ensure required response components are present
         response = answer.message
         response.server_addr = assign_zero(response.server_addr, self.server_id)
-        response.options.setdefault(DHCPMessageType(MessageType.Ack), 0)
-        response.options.setdefault(ServerIdentifier(self.server_id), 1)
+        response.options.setdefault(ACK, 0)
+        response.options.setdefault(server_identifier(self.server_id), 1)
         # ensure assignment matches request
         netmask  = request.subnet_mask()
         req_addr = request.requested_address()
         req_cast = request.broadcast_address()
         if (req_addr and req_addr != response.your_addr) \
             or (req_cast and req_cast != netmask):
-            response.options.insert(0, DHCPMessageType(MessageType.Nak))
+            response.options.insert(0, NAK)
         return response
 
     def process_decline(self, request: Message) -> Optional[Message]:
@@ -94,8 +130,8 @@ class Server(BaseSession):
         answer   = self.backend.decline(self.client, request)
         response = answer.message if answer else request.reply()
         response.server_addr = assign_zero(response.server_addr, self.server_id)
-        response.options.setdefault(DHCPMessageType(MessageType.Nak), 0)
-        response.options.setdefault(ServerIdentifier(self.server_id), 1)
+        response.options.setdefault(NAK, 0)
+        response.options.setdefault(server_identifier(self.server_id), 1)
         return response
 
     def process_release(self, request: Message) -> Optional[Message]:
@@ -105,8 +141,8 @@ class Server(BaseSession):
         answer   = self.backend.release(self.client, request)
         response = answer.message if answer else request.reply()
         response.server_addr = assign_zero(response.server_addr, self.server_id)
-        response.options.setdefault(DHCPMessageType(MessageType.Ack), 0)
-        response.options.setdefault(ServerIdentifier(self.server_id), 1)
+        response.options.setdefault(ACK, 0)
+        response.options.setdefault(server_identifier(self.server_id), 1)
         return response
 
     def process_inform(self, request: Message) -> Optional[Message]:
@@ -130,56 +166,49 @@ class Server(BaseSession):
         self.client:   Address   = addr
         self.writer:   UdpWriter = cast(UdpWriter, writer)
         self.addr_str: str       = '%s:%d' % self.client
-        self.logger.debug(f'{self.addr_str} | connection-made')
+        self.logger.debug('%s | connection-made', self.addr_str)
 
     def _send(self, request: Message, response: Optional[Message]):
         """
         broadcast dhcp response packet to the relevant ips
         """
         if not response:
-            self.logger.error(f'{self.addr_str} | no response given.')
+            self.logger.error('%s | no response given.', self.addr_str)
             self.writer.close()
             return
-        data = response.pack().rjust(300, b'\x00')
-        host = assign_zero(request.client_addr, request.gateway_addr)
-        host = assign_zero(host, IPv4Address(self.client.host))
-        host = assign_zero(host, self.broadcast)
-        host = str(host)
+        data = response.pack().ljust(MIN_SIZE, b'\x00')
+        addr = assign_zero(request.client_addr, request.gateway_addr)
+        if addr != ZeroIp:
+            host = str(addr)
+        elif self.client.host != ZERO_HOST:
+            host = self.client.host
+        else:
+            host = str(self.broadcast)
         self.logger.debug(
-            f'{self.addr_str} | sent {len(data)} bytes to {host}:{PORT}')
+            '%s | sent %d bytes to %s:%d', self.addr_str, len(data), host, PORT)
         self.writer.write(data, addr=(host, PORT))
 
     def data_recieved(self, data: bytes):
         """
         parse raw packet-data and process request
         """
-        self.logger.debug(f'{self.addr_str} | recieved {len(data)} bytes')
+        self.logger.debug('%s | recieved %d bytes', self.addr_str, len(data))
         request      = Message.unpack(data)
         message_type = request.message_type()
         if message_type is None:
             return
         response: Optional[Message] = None
         try:
-            if message_type == MessageType.Discover:
-                response = self.process_discover(request)
-            elif message_type == MessageType.Request:
-                response = self.process_request(request)
-            elif message_type == MessageType.Decline:
-                response = self.process_decline(request)
-            elif message_type == MessageType.Release:
-                response = self.process_release(request)
-            elif message_type == MessageType.Inform:
-                response = self.process_inform(request)
-            else:
-                response = self.process_unknown(request)
+            handler  = HANDLERS.get(message_type, 'process_unknown')
+            response = getattr(self, handler)(request)
         except DhcpError as e:
             response = response or request.reply()
-            response.options.setdefault(DHCPMessageType(MessageType.Nak), 0)
+            response.options.setdefault(NAK, 0)
             response.options.setdefault(DHCPStatusCode(e.code, str(e).encode()))
         except Exception as e:
             code     = StatusCode.UnspecFail
             response = response or request.reply()
-            response.options.setdefault(DHCPMessageType(MessageType.Nak))
+            response.options.setdefault(NAK)
             response.options.setdefault(DHCPStatusCode(code, str(e).encode()))
             raise e
         finally:
@@ -189,4 +218,4 @@ class Server(BaseSession):
         """
         debug log connection lost
         """
-        self.logger.debug(f'{self.addr_str} | connection-lost err={err}')
+        self.logger.debug('%s | connection-lost err=%s', self.addr_str, err)
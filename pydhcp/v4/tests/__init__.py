@@ -3,8 +3,9 @@ DHCPv4 Library UnitTests
 """
 
 #** Variables **#
-__all__ = ['MessageTests', 'MemoryTests']
+__all__ = ['MessageTests', 'OptionListTests', 'MemoryTests', 'CacheTests', 'ServerTests']
 
 #** Imports **#
 from .message import MessageTests
-from .server import MemoryTests
+from .options import OptionListTests
+from .server import MemoryTests, CacheTests, ServerTests
@@ -75,6 +75,72 @@ class MessageTests(TestCase):
         self.assertEqual(message.boot_file, b'')
         self.assertEqual(message.message_type(), MessageType.Discover)
         self.assertEqual(message.requested_address(), ZeroIp)
+        self.assertEqual(Message.peek(data),
+            (OpCode.BootRequest, 15645, MessageType.Discover))
+
+    def test_padding(self):
+        """
+        ensure pad bytes between options are skipped while parsing
+        """
+        data    = bytes.fromhex(DHCP_DISCOVER)
+        data    = data[:243] + b'\x00\x00' + data[243:]
+        message = Message.unpack(data)
+        self.assertEqual(len(message.options), 4)
+        self.assertEqual(message.message_type(), MessageType.Discover)
+        self.assertEqual(message.requested_address(), ZeroIp)
+
+    def test_truncated(self):
+        """
+        ensure options running past the end of the buffer are rejected
+        """
+        header = bytes.fromhex(DHCP_DISCOVER)[:240]
+        for name, options in (
+            ('router', bytes.fromhex('030801020304')),
+            ('domain', bytes.fromhex('0f0a') + b'abc'),
+            ('opcode', bytes.fromhex('03')),
+        ):
+            with self.subTest(name):
+                self.assertRaises(ValueError, Message.unpack, header + options)
+                self.assertRaises(ValueError, Message.peek, header + options)
+
+    def test_header_coercion(self):
+        """
+        ensure plain header addresses are converted when packing
+        """
+        message  = Message.unpack(bytes.fromhex(DHCP_OFFER))
+        expected = message.pack()
+        message.your_addr   = '192.168.0.10'
+        message.client_addr = 0
+        self.assertEqual(message.pack(), expected)
+        message.your_addr = 'invalid'
+        self.assertRaisesRegex(ValueError,
+            r'^MessageHeader\.your_addr->', message.pack)
+
+    def test_header_overflow(self):
+        """
+        ensure out-of-range header values name their field when packing
+        """
+        for field, attr, value in (
+            ('hops',       'hops',    300),
+            ('seconds',    'seconds', -1),
+            ('message_id', 'id',      2**32),
+        ):
+            with self.subTest(field):
+                message = Message.unpack(bytes.fromhex(DHCP_DISCOVER))
+                setattr(message, attr, value)
+                self.assertRaisesRegex(OverflowError,
+                    rf'^MessageHeader\.{field}->', message.pack)
+
+    def test_header_invalid(self):
+        """
+        ensure unknown header enum values name their field when parsing
+        """
+        for field, index in (('opcode', 0), ('hw_type', 1)):
+            with self.subTest(field):
+                data = bytearray.fromhex(DHCP_DISCOVER)
+                data[index] = 250
+                self.assertRaisesRegex(ValueError,
+                    rf'^MessageHeader\.{field}->', Message.unpack, bytes(data))
 
     def test_offer(self):
         """
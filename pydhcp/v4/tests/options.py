@@ -0,0 +1,163 @@
+"""
+DHCP OptionList Collection UnitTests
+"""
+from ipaddress import IPv4Address
+from typing import ClassVar
+from unittest import TestCase
+
+from pystructs import U16
+
+from .. import *
+from ...abc import OptionList
+from .. import options
+from ..options import OPTION_MAP, OPTION_TABLE, unpack_option
+
+#** Variables **#
+__all__ = ['OptionListTests']
+
+#** Classes **#
+
+class OptionListTests(TestCase):
+    """
+    DHCP OptionList Lookup and Ordering UnitTests
+    """
+
+    def setUp(self):
+        """
+        setup option-list for testing
+        """
+        self.options = OptionList([
+            DHCPMessageType(MessageType.Ack),
+            SubnetMask(IPv4Address('255.255.255.0')),
+            Router([IPv4Address('192.168.1.1')]),
+        ])
+
+    def test_lookup(self):
+        """
+        ensure options can be retrieved by opcode and option type
+        """
+        self.assertEqual(self.options[OptionCode.SubnetMask].mask,
+            IPv4Address('255.255.255.0'))
+        self.assertEqual(self.options.get(Router), self.options.data[2])
+        self.assertIsNone(self.options.get(DomainNameServer))
+        self.assertIn(OptionCode.Router, self.options)
+        self.assertIn(Router, self.options)
+        self.assertEqual(self.options[Router], self.options.get(Router))
+        self.assertNotIn(OptionCode.DomainNameServer, self.options)
+        self.assertEqual(self.options.multi_get(Router, DomainNameServer),
+            (self.options.data[2], None))
+        with self.assertRaises(KeyError):
+            self.options[OptionCode.DomainNameServer]
+
+    def test_duplicates(self):
+        """
+        ensure duplicate options replace existing options in-place
+        """
+        options = OptionList([*self.options, DHCPMessageType(MessageType.Nak)])
+        self.assertEqual(len(options), 3)
+        self.assertEqual(options.data[0], DHCPMessageType(MessageType.Nak))
+        options = OptionList.from_list([*self.options, self.options.data[0]])
+        self.assertEqual(len(options), 3)
+        self.assertEqual(options.index(self.options.data[2]), 2)
+        self.options.append(DHCPMessageType(MessageType.Offer))
+        self.assertEqual(len(self.options), 3)
+        self.assertEqual(self.options.data[0], DHCPMessageType(MessageType.Offer))
+
+    def test_insert(self):
+        """
+        ensure insert moves existing options with the same opcode
+        """
+        self.options.insert(0, Router([IPv4Address('192.168.1.2')]))
+        self.assertEqual(len(self.options), 3)
+        self.assertEqual(self.options.data[0].opcode, OptionCode.Router)
+        self.assertEqual(self.options.get(Router).ips,
+            [IPv4Address('192.168.1.2')])
+        self.options.remove(self.options.data[0])
+        self.assertEqual(len(self.options), 2)
+        self.assertNotIn(Router, self.options)
+
+    def test_index(self):
+        """
+        ensure option positions are tracked across list modifications
+        """
+        mask = self.options.data[1]
+        self.assertEqual(self.options.index(mask), 1)
+        self.assertIsNone(self.options.find(mask, 2))
+        self.assertIsNone(self.options.find(SubnetMask(IPv4Address('0.0.0.0'))))
+        self.options.insert(0, DomainNameServer([IPv4Address('1.1.1.1')]))
+        self.assertEqual(self.options.index(mask), 2)
+        self.options.remove(self.options.data[1])
+        self.assertEqual(self.options.index(mask), 1)
+        self.assertEqual(self.options[OptionCode.Router].opcode,
+            OptionCode.Router)
+        with self.assertRaises(ValueError):
+            self.options.index(Router([]))
+
+    def test_registry(self):
+        """
+        ensure every exported option type is registered under its own opcode
+        """
+        for name in options.__all__:
+            oclass = getattr(options, name)
+            if isinstance(oclass, type) and issubclass(oclass, Option) \
+                and hasattr(oclass, 'opcode'):
+                self.assertIs(OPTION_MAP[oclass.opcode], oclass, name)
+
+    def test_custom(self):
+        """
+        ensure options defined after import are decoded by message unpack
+        """
+        opcode = OptionCode.InterfaceMTU
+        self.addCleanup(OPTION_MAP.pop, opcode, None)
+        self.addCleanup(OPTION_TABLE.__setitem__, opcode, None)
+
+        class InterfaceMTU(Option):
+            opcode: ClassVar[OptionCode] = OptionCode.InterfaceMTU
+            mtu:    U16
+
+        self.assertIs(OPTION_TABLE[opcode], InterfaceMTU)
+        message = Message.discover(1, bytes.fromhex('aabbccddeeff'))
+        message.options.append(InterfaceMTU(1500))
+        message = Message.unpack(message.pack())
+        self.assertEqual(message.options.get(opcode), InterfaceMTU(1500))
+
+    def test_unknown(self):
+        """
+        ensure both decode entry points accept opcodes missing from OptionCode
+        """
+        raw     = bytes.fromhex('5402abcd')
+        option  = unpack_option(raw)
+        message = Message.discover(1, bytes.fromhex('aabbccddeeff'))
+        message = Message.unpack(message.pack()[:-1] + raw + b'\xff')
+        self.assertEqual(option.opcode, 84)
+        self.assertEqual(option.pack(), bytes.fromhex('abcd'))
+        self.assertIs(type(message.options.get(84)), type(option))
+        self.assertEqual(message.options.get(84).pack(), option.pack())
+
+    def test_coercion(self):
+        """
+        ensure fixed-layout options coerce plain values when packing
+        """
+        mask = b'\xff\xff\xff\x00'
+        self.assertEqual(SubnetMask('255.255.255.0').pack(), mask)
+        self.assertEqual(SubnetMask(0xFFFFFF00).pack(), mask)
+        self.assertEqual(ServerIdentifier('10.0.0.1').pack(), b'\n\x00\x00\x01')
+        self.assertEqual(IPLeaseTime('3600').pack(), b'\x00\x00\x0e\x10')
+        with self.assertRaises(ValueError):
+            SubnetMask('invalid').pack()
+        with self.assertRaises(OverflowError):
+            MaxMessageSize(-1).pack()
+
+    def test_invalid_values(self):
+        """
+        ensure invalid enum values report the failing option field
+        """
+        for oclass, raw, field in (
+            (ParamRequestList, b'\x01\x54', 'params'),
+            (ClientSystemArch, b'\xff\xff', 'arches'),
+            (DHCPMessageType, b'\x63', 'mtype'),
+        ):
+            with self.subTest(oclass.__name__):
+                with self.assertRaisesRegex(ValueError,
+                    f'^{oclass.__name__}.{field}->'):
+                    oclass.unpack(raw)
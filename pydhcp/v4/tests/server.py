@@ -4,15 +4,18 @@ DHCPv4 Server In-Memory Backend UnitTests
 import time
 import random
 from datetime import timedelta
-from ipaddress import IPv4Address, IPv4Network
+from ipaddress import IPv4Address, IPv4Interface, IPv4Network
 from unittest import TestCase
 
 from .. import *
 
-from ..server.backend import Address, MemoryBackend
+from ..server import Server
+from ..server.backend import Address, CacheBackend, MemoryBackend
+from ..server.backend.cache import CacheRecord
+from ..server.backend.simple import SimpleAnswer
 
 #** Variables **#
-__all__ = ['MemoryTests']
+__all__ = ['MemoryTests', 'CacheTests', 'ServerTests']
 
 ADDR   = Address('0.0.0.0', 67)
 HWADDR = 'aa:bb:cc:dd:ee:ff'.replace(':', '')
@@ -96,6 +99,19 @@ class MemoryTests(TestCase):
             return self.assertTrue(False, 'response is none')
         self.assertEqual(answer.ipv4.ip, static)
 
+    def test_static_reassign(self):
+        """
+        ensure reassigned static addresses return to the address-pool
+        """
+        self.backend.set_static(HWADDR, IPv4Address('192.168.1.2'))
+        self.backend.set_static(HWADDR, IPv4Address('192.168.1.3'))
+        for n in (2, 4):
+            newhw  = bytes([random.randint(0, 255) for _ in range(6)])
+            answer = self.backend.request_address(newhw.hex(), None)
+            if answer is None:
+                return self.assertTrue(False, 'response is none')
+            self.assertEqual(answer.ipv4.ip, IPv4Address(f'192.168.1.{n}'))
+
     def test_exhaust(self):
         """
         ensure backend does not crash on ip-exhastion
@@ -108,3 +124,152 @@ class MemoryTests(TestCase):
             self.assertEqual(answer.ipv4.ip, IPv4Address(f'192.168.1.{n}'))
         answer = self.backend.request_address(HWADDR, None)
         self.assertIsNone(answer, 'addresses should be exhausted')
+
+class CacheTests(TestCase):
+    """
+    Server Cache Backend Eviction and Expiration UnitTests
+    """
+
+    def setUp(self):
+        """
+        setup cache backend over a memory backend for testing
+        """
+        self.memory = MemoryBackend(
+            network=IPv4Network('192.168.1.0/24'),
+            dns=[IPv4Address('1.1.1.1')],
+            gateway=IPv4Address('192.168.1.1'),
+        )
+        self.backend = CacheBackend(self.memory, maxsize=2, ignore_sources=set())
+
+    def record(self, lease: float, lifetime: float) -> CacheRecord:
+        """
+        build cache record for the specified lease and lifetime
+        """
+        answer = SimpleAnswer(
+            source='TEST',
+            lease=timedelta(seconds=lease),
+            ipv4=IPv4Interface('192.168.1.2/24'),
+            routers=[],
+            dns=[],
+        )
+        return CacheRecord(answer, timedelta(seconds=lifetime))
+
+    def test_cached(self):
+        """
+        ensure repeated requests are answered from cache
+        """
+        first  = self.backend.request_address('aa', None)
+        second = self.backend.request_address('aa', None)
+        if first is None or second is None:
+            return self.assertTrue(False, 'response is none')
+        self.assertEqual(first.source, MemoryBackend.source)
+        self.assertEqual(second.source, CacheBackend.source)
+        self.assertEqual(first.ipv4, second.ipv4)
+
+    def test_eviction(self):
+        """
+        ensure the least-recently used record is evicted at maxsize
+        """
+        for mac in ('aa', 'bb', 'cc'):
+            self.backend.request_address(mac, None)
+        self.assertListEqual(list(self.backend.cache), ['bb', 'cc'])
+
+    def test_promotion(self):
+        """
+        ensure cache hits protect records from eviction
+        """
+        for mac in ('aa', 'bb'):
+            self.backend.request_address(mac, None)
+        self.assertIsNotNone(self.backend.get_cache('aa'))
+        self.assertListEqual(list(self.backend.cache), ['bb', 'aa'])
+        self.backend.request_address('cc', None)
+        self.assertListEqual(list(self.backend.cache), ['aa', 'cc'])
+
+    def test_expiration(self):
+        """
+        ensure records expire at min(lifetime, lease - lifetime)
+        """
+        for lease, lifetime, ttl in ((3600, 30, 30), (40, 30, 10)):
+            with self.subTest(lease=lease, lifetime=lifetime):
+                record = self.record(lease, lifetime)
+                start  = record.ends - lease
+                self.assertAlmostEqual(record.expires - start, ttl)
+                self.assertFalse(record.is_expired())
+        with self.subTest('lease within lifetime'):
+            self.assertTrue(self.record(20, 30).is_expired())
+        with self.subTest('deadline passed'):
+            record = self.record(0.3, 0.1)
+            self.assertFalse(record.is_expired())
+            time.sleep(0.15)
+            self.assertTrue(record.is_expired())
+
+    def test_served_lease(self):
+        """
+        ensure cache hits serve the remaining lease in whole seconds
+        """
+        record = self.record(3600, 30)
+        self.assertFalse(record.is_expired())
+        self.assertEqual(record.answer.lease, timedelta(seconds=3600))
+        record.ends -= 1.5
+        self.assertFalse(record.is_expired())
+        self.assertEqual(record.answer.lease, timedelta(seconds=3599))
+
+class FakeWriter:
+    """
+    UDP Writer Stand-In that Records Written Packets
+    """
+
+    def __init__(self):
+        self.packets = []
+
+    def write(self, data: bytes, addr=None):
+        self.packets.append((data, addr))
+
+    def close(self):
+        pass
+
+class ServerTests(TestCase):
+    """
+    DHCP Server Session Request/Response UnitTests
+    """
+
+    def setUp(self):
+        """
+        setup server session over a memory backend for testing
+        """
+        self.server_id = IPv4Address('192.168.1.1')
+        self.backend   = MemoryBackend(
+            network=IPv4Network('192.168.1.0/29'),
+            dns=[IPv4Address('1.1.1.1')],
+            gateway=self.server_id,
+        )
+
+    def exchange(self, request: Message) -> Message:
+        """
+        pass request through a new server session and decode the response
+        """
+        writer = FakeWriter()
+        server = Server(backend=self.backend, server_id=self.server_id)
+        server.connection_made(Address('0.0.0.0', 68), writer)
+        server.data_recieved(request.pack())
+        self.assertEqual(len(writer.packets), 1)
+        data, _ = writer.packets[0]
+        self.assertEqual(len(data), 300)
+        return Message.unpack(data)
+
+    def test_discover_request(self):
+        """
+        ensure short replies are padded at the end and decode as offer/ack
+        """
+        hwaddr   = bytes.fromhex(HWADDR)
+        response = self.exchange(Message.discover(7, hwaddr))
+        self.assertEqual(response.op, OpCode.BootReply)
+        self.assertEqual(response.id, 7)
+        self.assertEqual(response.message_type(), MessageType.Offer)
+        self.assertEqual(response.server_identifier(), self.server_id)
+        offered  = response.your_addr
+        response = self.exchange(Message.request(8, hwaddr, offered))
+        self.assertEqual(response.id, 8)
+        self.assertEqual(response.message_type(), MessageType.Ack)
+        self.assertEqual(response.your_addr, offered)
+